@@ -0,0 +1,111 @@
+"""Optional Cython extensions build script
+
+Builds extensions in place in a source checkout, published wheels are pure
+python and do not include them. Extensions are skipped if Cython or a C compiler
+is not available, comforticons falls back to numpy implementation.
+
+Compiled helpers (Cython extension and numba helpers) duplicate numpy cell
+layout of PixelGenerator, `check` compares them, built extensions not matching
+numpy implementation are removed.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+from typing import Iterable
+
+EXTENSIONS = {
+    "comforticons.generators._cfast": "comforticons/generators/_cfast.pyx",
+}
+
+
+def check(names: Iterable[str] = ("_cfast", "_jit")) -> list[str]:
+    """Compare available compiled helpers with numpy implementation
+
+    Avatars of sizes 1-16 are generated from random data by every helper.
+
+    :param names: helpers module names, defaults to all helpers
+    :type names: Iterable[str], optional
+    :return: names of helpers not matching numpy implementation
+    :rtype: list[str]
+    """
+    import numpy as np
+
+    from comforticons.generators.image import PixelGenerator, _load_helpers
+
+    helpers = {
+        name: _load_helpers(name) if name in names else None
+        for name in ("_cfast", "_jit")
+    }
+    mismatches = []
+    rng = np.random.default_rng(0)
+    for size in range(1, 17):
+        generator = PixelGenerator(size, image_format="raw", jit=False)
+        for raw in rng.integers(0, 256, (32, generator._data_bytes), dtype=np.uint8):
+            matrix = np.unpackbits(raw)[generator._cells]
+            if helpers["_cfast"] is not None:
+                cells = np.empty((size, size), dtype=np.uint8)
+                helpers["_cfast"].build_matrix(raw, size, cells)
+                if not np.array_equal(cells, matrix):
+                    mismatches.append("_cfast")
+            if helpers["_jit"] is not None:
+                background, foreground = generator._colors(raw)
+                pixels = helpers["_jit"].build_pixels(
+                    raw, size, size * 3 + 1, 2, foreground, background
+                )
+                if not np.array_equal(
+                    pixels, generator._render_raw(raw, matrix, size * 3 + 1, 2)
+                ):
+                    mismatches.append("_jit")
+    return sorted(set(mismatches))
+
+
+def build() -> None:
+    """Build extensions in place"""
+    try:
+        from Cython.Build import cythonize
+        from setuptools import Distribution, Extension
+        from setuptools.command.build_ext import build_ext
+    except ImportError:
+        print("Cython is not installed, skipping extensions")
+        return
+
+    try:
+        distribution = Distribution(
+            {
+                "name": "comforticons",
+                "ext_modules": cythonize(
+                    [Extension(name, [path]) for name, path in EXTENSIONS.items()]
+                ),
+            }
+        )
+        command = build_ext(distribution)
+        command.ensure_finalized()
+        command.run()
+    except Exception as exc:  # Cython and compiler errors differ between platforms
+        print(f"Failed to build extensions, skipping: {exc}")
+        return
+
+    # Copy built extensions next to their sources
+    extensions = []
+    for output in command.get_outputs():
+        extensions.append(os.path.relpath(output, command.build_lib))
+        shutil.copyfile(output, extensions[-1])
+
+    # numba helpers are compiled at runtime, only check built extensions
+    try:
+        matching = not check(["_cfast"])
+    except ImportError:
+        print("Runtime dependencies are not installed, skipping extensions check")
+        return
+    except Exception as exc:  # broken extensions may fail in any way
+        print(f"Extensions check failed: {exc}")
+        matching = False
+    if not matching:
+        print("Extensions do not match numpy implementation, skipping")
+        for extension in extensions:
+            os.remove(extension)
+
+
+if __name__ == "__main__":
+    build()
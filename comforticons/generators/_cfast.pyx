@@ -0,0 +1,35 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Cython compiled image generators helpers
+
+Optional extension, built by build_extensions.py if Cython and a C compiler are available.
+"""
+
+
+def build_matrix(const unsigned char[:] raw, int size, unsigned char[:, ::1] out):
+    """Build PixelGenerator symmetric cell matrix
+
+    :param raw: avatar data bytes, at least ceil((ceil(size / 2) * size + 8) / 8) long
+    :type raw: const unsigned char[:]
+    :param size: avatar features size
+    :type size: int
+    :param out: (size, size) uint8 output matrix
+    :type out: unsigned char[:, ::1]
+    """
+    cdef int column, row, cell, bit
+
+    if raw.shape[0] < ((size // 2 + size % 2) * size + 15) // 8:
+        raise IndexError("not enough data for the matrix")
+    if out.shape[0] != size or out.shape[1] != size:
+        raise ValueError("output matrix must be (size, size)")
+
+    with nogil:
+        for column in range(size // 2 + size % 2):
+            for row in range(size):
+                # Do not use first byte (since that one is used for determining
+                # the foreground colour).
+                cell = column * size + row
+                bit = (raw[1 + cell // 8] >> (7 - cell % 8)) & 1
+                # Mark the cell and its reflection. Central column may get
+                # marked twice, but we don't care.
+                out[row, column] = bit
+                out[row, size - column - 1] = bit
@@ -0,0 +1,62 @@
+"""Numba compiled image generators helpers
+
+Requires optional numba dependency, import is handled by the image generators module.
+"""
+from __future__ import annotations
+
+import numba
+import numpy as np
+
+
+@numba.njit(cache=True)
+def build_pixels(
+    raw: np.ndarray,
+    size: int,
+    avatar_size: int,
+    padding: int,
+    fg_rgba: np.ndarray,
+    bg_rgba: np.ndarray,
+) -> np.ndarray:
+    """Build PixelGenerator avatar RGBA pixels
+
+    :param raw: avatar data bytes
+    :type raw: np.ndarray
+    :param size: avatar features size
+    :type size: int
+    :param avatar_size: generated square avatar dimensions
+    :type avatar_size: int
+    :param padding: generated avatar padding
+    :type padding: int
+    :param fg_rgba: foreground color
+    :type fg_rgba: np.ndarray
+    :param bg_rgba: background color
+    :type bg_rgba: np.ndarray
+    :return: (avatar_size + 2 * padding, avatar_size + 2 * padding, 4) uint8 array
+    :rtype: np.ndarray
+    """
+    block_size = avatar_size // size
+    dimensions = avatar_size + padding * 2
+    pixels = np.empty((dimensions, dimensions, 4), dtype=np.uint8)
+    for y in range(dimensions):
+        for x in range(dimensions):
+            pixels[y, x] = bg_rgba
+
+    for column in range(size // 2 + size % 2):
+        for row in range(size):
+            # Do not use first byte (since that one is used for determining
+            # the foreground colour).
+            cell = column * size + row
+            if not (raw[1 + cell // 8] >> (7 - cell % 8)) & 1:
+                continue
+            # Fill the block and its reflection. Central column may get
+            # filled twice, but we don't care.
+            top = padding + row * block_size
+            for block_column in (column, size - column - 1):
+                left = padding + block_column * block_size
+                for y in range(top, top + block_size):
+                    for x in range(left, left + block_size):
+                        pixels[y, x] = fg_rgba
+    return pixels
+
+
+__all__ = ["build_pixels"]
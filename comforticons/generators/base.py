@@ -1,14 +1,19 @@
 """Base generator interface module"""
 from __future__ import annotations
 
+from typing import Iterable, Iterator
+
 
 class BaseGenerator:
     """Avatar generator interface
 
+    :cvar supports_bytes: generator accepts raw bytes data as well as hex strings
     :ivar size: avatar features size (grid size, rings amount, etc)
     :ivar entropy: required entropy for this generator
     """
 
+    supports_bytes: bool = False
+
     def __init__(
         self,
         size: int,
@@ -35,13 +40,13 @@ class BaseGenerator:
         """
         return provided_entropy >= self.entropy
 
-    def generate(self, data: str, avatar_size: int) -> None:
+    def generate(self, data: str | bytes, avatar_size: int) -> None:
         """Generate avatar
 
         Note: Do not use directly, this class is an example/interface and returns None!
 
-        :param data: avatar data
-        :type data: str
+        :param data: avatar data, hex string or raw bytes if `supports_bytes`
+        :type data: str | bytes
         :param avatar_size: generated avatar dimensions (image dimensions, width of ascii 'image')
         :type avatar_size: int
         :return: generated avatar
@@ -49,5 +54,21 @@ class BaseGenerator:
         """
         return None
 
+    def generate_many(
+        self, data: Iterable[str | bytes], *args, **kwargs
+    ) -> Iterator[None]:
+        """Generate avatars for every item of `data`
+
+        Generators may override this to amortize per-avatar setup, by default
+        every item is passed to `generate` with the rest of the arguments.
+
+        :param data: avatars data
+        :type data: Iterable[str | bytes]
+        :return: iterator over generated avatars
+        :rtype: Iterator[None]
+        """
+        for item in data:
+            yield self.generate(item, *args, **kwargs)
+
 
 __all__ = ["BaseGenerator"]
@@ -1,10 +1,16 @@
 """Image icon generators module"""
 from __future__ import annotations
 
+import functools
+import importlib
 import io
-from typing import Literal
+import threading
+from typing import TYPE_CHECKING, Iterable, Iterator, Literal
 
-from PIL import Image, ImageDraw
+import numpy as np
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 from .base import BaseGenerator
 
@@ -154,6 +160,68 @@ HTML_COLORS = [
 ]
 
 
+def _parse_colors(colors: list[str]) -> np.ndarray:
+    """Parse color strings to RGBA colors array
+
+    :param colors: list of color strings supported by Pillow (hex, names, etc)
+    :type colors: list[str]
+    :return: (len(colors), 4) uint8 array of RGBA colors
+    :rtype: np.ndarray
+    """
+    from PIL import ImageColor
+
+    return np.array(
+        [ImageColor.getcolor(color, "RGBA") for color in colors], dtype=np.uint8
+    ).reshape(-1, 4)
+
+
+def _check_colors(colors: np.ndarray) -> np.ndarray:
+    """Check preparsed colors array, RGB colors are made opaque RGBA
+
+    :param colors: (N, 3) RGB or (N, 4) RGBA array of 0-255 integers
+    :type colors: np.ndarray
+    :raises ValueError: if `colors` is not an (N, 3) or (N, 4) array of 0-255 integers
+    :return: (N, 4) uint8 array of RGBA colors
+    :rtype: np.ndarray
+    """
+    if (
+        colors.ndim != 2
+        or colors.shape[1] not in (3, 4)
+        or not np.issubdtype(colors.dtype, np.integer)
+        or (colors.size and (colors.min() < 0 or colors.max() > 255))
+    ):
+        raise ValueError(
+            f"Preparsed colors must be (N, 3) RGB or (N, 4) RGBA array of 0-255 integers, got {colors.shape} {colors.dtype} array"
+        )
+    if colors.shape[1] == 3:
+        colors = np.concatenate((colors, np.full((len(colors), 1), 255)), axis=1)
+    return np.asarray(colors, dtype=np.uint8)
+
+
+"""HTML named colors (N, 4) uint8 RGBA array, parsed on import without Pillow"""
+HTML_COLORS_RGBA = np.frombuffer(
+    bytes.fromhex("".join(color[1:] + "FF" for color in HTML_COLORS)), dtype=np.uint8
+).reshape(-1, 4)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_helpers(name: str):
+    """Import compiled helpers module
+
+    Helpers require optional numba dependency (`_jit`) or built Cython extension
+    (`_cfast`), numpy implementation is used without them.
+
+    :param name: helpers module name
+    :type name: str
+    :return: helpers module or None if it can not be imported
+    :rtype: ModuleType | None
+    """
+    try:
+        return importlib.import_module(f".{name}", __package__)
+    except ImportError:
+        return None
+
+
 class PixelGenerator(BaseGenerator):
     """Pixel square grid identicon generator (gravatar "retro" type)
 
@@ -174,17 +242,26 @@ class PixelGenerator(BaseGenerator):
     Simply put, the generated identicons are small symmetric mosaics with
     optional padding.
 
+    Encoding stream and padded image canvas are reused between generations, every
+    thread gets its own, so a generator can be shared between threads.
+
     :ivar size: avatar features size
     :ivar entropy: required entropy
     """
 
+    supports_bytes: bool = True
+
     def __init__(
         self,
         size: int = 5,
-        foreground_colors: list[str] = HTML_COLORS,
+        foreground_colors: list[str] | np.ndarray | None = None,
         background: str = "#00000000",
-        image_format: Literal["png", "jpeg", "jpg"] = "png",
+        image_format: Literal["png", "jpeg", "jpg", "raw"] = "png",
         invert: bool = False,
+        optimize: bool = False,
+        compress_level: int = 1,
+        quality: int = 75,
+        jit: bool = True,
     ):
         """Constructor
 
@@ -192,21 +269,126 @@ class PixelGenerator(BaseGenerator):
 
         :param size: avatar features size, defaults to 5
         :type size: int, optional
-        :param foreground_colors: list of hex background color strings, defaults to
-        :type foreground_colors: list[str], optional
+        :param foreground_colors: list of hex foreground color strings or preparsed (N, 4) RGBA or (N, 3) RGB array of 0-255 integers, defaults to HTML_COLORS_RGBA
+        :type foreground_colors: list[str] | np.ndarray | None, optional
         :param background: hex background color string, defaults to "#00000000" - transparent black
         :type background: str, optional
+        :param image_format: case insensitive image format, "raw" for (height, width, 4) RGBA uint8 numpy array of pixels, not converted to any image mode and not encoded, defaults to "png"
+        :type image_format: Literal["png", "jpeg", "jpg", "raw"], optional
         :param invert: invert foreground and background colors, defaults to False
         :type invert: bool, optional
+        :param optimize: let Pillow spend extra time on minimal file size, defaults to False
+        :type optimize: bool, optional
+        :param compress_level: png zlib compression level 0-9, defaults to 1 - fastest
+        :type compress_level: int, optional
+        :param quality: jp(e)g quality 0-95, defaults to 75
+        :type quality: int, optional
+        :param jit: use numba compiled helpers for "raw" pixels if numba is installed, defaults to True
+        :type jit: bool, optional
+        :raises ValueError: if preparsed `foreground_colors` array is malformed
         """
         super().__init__(size)
-        self.entropy = (
-            self.size // 2 + self.size % 2
-        ) * self.size + 8  # Y axis symmetry + 8 bits for color selection
+        # Y axis symmetry - only half of the columns (rounded-up) is encoded
+        self._half_cells = (self.size // 2 + self.size % 2) * self.size
+        self.entropy = self._half_cells + 8  # + 8 bits for color selection
+        if foreground_colors is None:
+            foreground_colors = HTML_COLORS_RGBA
         self.foreground_colors = foreground_colors
         self.background = background
         self.format = image_format
         self.invert = invert
+        self.optimize = optimize
+        self.compress_level = compress_level
+        self.quality = quality
+        self.jit = jit
+        self._tls = threading.local()
+
+        # Precompute the data bit index of every matrix cell. Since the
+        # identicon needs to be symmetric, only half the columns (rounded-up)
+        # are encoded, cell by cell and column by column, and reflected by the
+        # Y axis. Do not use first byte (since that one is used for determining
+        # the foreground colour).
+        columns = np.arange(self.size)
+        half_columns = np.minimum(columns, self.size - columns - 1)
+        self._cells = 8 + half_columns * self.size + columns[:, np.newaxis]
+        # Only these leading data bytes are encoded in the identicon
+        self._data_bytes = -(-self.entropy // 8)
+
+    def __getstate__(self) -> dict:
+        """Get state for pickling and copying, without per-thread stream and canvas
+
+        :return: instance state
+        :rtype: dict
+        """
+        state = self.__dict__.copy()
+        del state["_tls"]
+        return state
+
+    def __setstate__(self, state: dict):
+        """Restore state from pickling and copying, with fresh per-thread storage
+
+        :param state: instance state
+        :type state: dict
+        """
+        self.__dict__.update(state)
+        self._tls = threading.local()
+
+    @property
+    def foreground_colors(self) -> np.ndarray:
+        """Foreground colors, parsed once on assignment
+
+        :return: (N, 4) uint8 array of RGBA colors
+        :rtype: np.ndarray
+        """
+        return self._foreground_colors
+
+    @foreground_colors.setter
+    def foreground_colors(self, foreground_colors: list[str] | np.ndarray):
+        # Parse colors once, so generation does not touch color strings
+        self._foreground_colors = (
+            _check_colors(foreground_colors)
+            if isinstance(foreground_colors, np.ndarray)
+            else _parse_colors(foreground_colors)
+        )
+        self._n_fg = len(self._foreground_colors)
+
+    @property
+    def background(self) -> str:
+        """Background color string, parsed once on assignment
+
+        :return: background color string
+        :rtype: str
+        """
+        return self._background
+
+    @background.setter
+    def background(self, background: str):
+        self._background = background
+        self._bg_rgba = _parse_colors([background])[0]
+
+    @property
+    def format(self) -> str:
+        """Image format, lowercased on assignment
+
+        :return: lowercase image format
+        :rtype: str
+        """
+        return self._format
+
+    @format.setter
+    def format(self, image_format: str):
+        self._format = image_format.lower()
+
+    @property
+    def _jit(self) -> bool:
+        """Whether numba compiled helpers are used, decided on use from `format`
+
+        Helpers module is looked up on use as well, so the generator stays picklable.
+
+        :return: True if "raw" pixels are built by numba compiled helpers
+        :rtype: bool
+        """
+        return self.jit and self.format == "raw" and _load_helpers("_jit") is not None
 
     def _data_to_byte_list(self, data: str) -> list[int]:
         """Convert incoming data string (hopefully hexdigest of hash function) to list of int bytes
@@ -218,7 +400,7 @@ class PixelGenerator(BaseGenerator):
         :return: list of integers 0-255 (byte)
         :rtype: list[int]
         """
-        return [int(data[i * 2 : i * 2 + 2], 16) for i in range(len(data) // 2)]
+        return list(bytes.fromhex(data))
 
     def _get_bit(self, n: int, data: list[int]) -> bool:
         """Get bit from data byte list
@@ -235,18 +417,199 @@ class PixelGenerator(BaseGenerator):
 
         return data[n // 8] >> int(8 - ((n % 8) + 1)) & 1 == 1
 
-    def generate(self, data: str, avatar_size: int = 120, padding: int = 0) -> bytes:
-        """Generate pixel identicon
+    def _matrix(self, raw: np.ndarray) -> np.ndarray:
+        """Build symmetric cell matrices
 
-        :param data: avatar data
-        :type data: str
+        Unpacks the used data bits and picks the bit of every cell, including the
+        reflected ones, in a single lookup. Leading `raw` dimensions are kept, so a
+        whole (N, data length) batch is processed at once. Matrices are compact
+        uint8 arrays, one byte per cell.
+
+        :param raw: avatar data bytes, (..., data length) array
+        :type raw: np.ndarray
+        :return: (..., size, size) uint8 array of cell bits
+        :rtype: np.ndarray
+        """
+        cfast = _load_helpers("_cfast")
+        if cfast is not None and raw.ndim == 1:
+            matrix = np.empty((self.size,) * 2, dtype=np.uint8)
+            cfast.build_matrix(raw, self.size, matrix)
+            return matrix
+        return np.unpackbits(raw[..., : self._data_bytes], axis=-1)[..., self._cells]
+
+    def _colors(self, raw: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Select avatar colors
+
+        :param raw: avatar data bytes
+        :type raw: np.ndarray
+        :return: background and foreground RGBA colors
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        background, foreground = (
+            self._bg_rgba,
+            self.foreground_colors[int(raw[0]) % self._n_fg],  # Select foreground color
+        )
+        # Swap selected colors
+        if self.invert:
+            background, foreground = foreground, background
+        return background, foreground
+
+    def _render_raw(
+        self,
+        raw: np.ndarray,
+        matrix: np.ndarray | None,
+        avatar_size: int,
+        padding: int,
+    ) -> np.ndarray:
+        """Render pixel identicon RGBA pixels without Pillow
+
+        :param raw: avatar data bytes
+        :type raw: np.ndarray
+        :param matrix: (size, size) symmetric matrix of `raw` cell bits, None to use numba compiled helpers
+        :type matrix: np.ndarray | None
+        :param avatar_size: generated square avatar dimensions
+        :type avatar_size: int
+        :param padding: generated square avatar dimensions
+        :type avatar_size: int
+        :return: (height, width, 4) uint8 array of avatar pixels
+        :rtype: np.ndarray
+        """
+        background, foreground = self._colors(raw)
+
+        if matrix is None:
+            return _load_helpers("_jit").build_pixels(
+                raw, self.size, avatar_size, padding, foreground, background
+            )
+
+        # Repeat every block pixel.
+        block_size = avatar_size // self.size
+        pixels = np.where(
+            matrix.view(np.bool_)[:, :, np.newaxis], foreground, background
+        )
+        pixels = pixels.repeat(block_size, axis=0).repeat(block_size, axis=1)
+
+        image = np.empty((avatar_size + padding * 2,) * 2 + (4,), dtype=np.uint8)
+        image[:] = background
+        image[padding : padding + len(pixels), padding : padding + len(pixels)] = pixels
+        return image
+
+    def _render(
+        self,
+        raw: np.ndarray,
+        matrix: np.ndarray,
+        avatar_size: int,
+        padding: int,
+    ) -> Image.Image:
+        """Render pixel identicon image
+
+        :param raw: avatar data bytes
+        :type raw: np.ndarray
+        :param matrix: (size, size) symmetric matrix of `raw` cell bits
+        :type matrix: np.ndarray
         :param avatar_size: generated square avatar dimensions
         :type avatar_size: int
         :param padding: generated square avatar dimensions
         :type avatar_size: int
-        :return: bytes of generated avatar encoded by PIL in `image_format`
+        :return: avatar image, ready to be saved in `image_format`
+        :rtype: Image.Image
+        """
+        from PIL import Image
+
+        background, foreground = self._colors(raw)
+
+        # Render one palette pixel per block (matrix values are palette indices
+        # of background and foreground) and scale it up to the blocks size,
+        # instead of drawing every block rectangle on its own.
+        block_size = avatar_size // self.size
+        image = Image.frombytes("P", (self.size,) * 2, matrix.tobytes()).resize(
+            (block_size * self.size,) * 2, Image.Resampling.NEAREST
+        )
+
+        # Blocks do not cover the whole avatar if there is padding or
+        # `avatar_size` is not divisible by `size`.
+        if padding or image.width != avatar_size:
+            canvas = self._canvas(avatar_size + padding * 2)
+            canvas.paste(image, (padding, padding))
+            image = canvas
+        image.putpalette(np.concatenate((background, foreground)).tobytes(), "RGBA")
+
+        # Account for non-transparent jp(e)g images, png stores palette images
+        if self.format in ("jpg", "jpeg"):
+            image = image.convert("RGB")
+        elif self.format != "png":
+            image = image.convert("RGBA")
+        return image
+
+    def _canvas(self, dimensions: int) -> Image.Image:
+        """Get this thread's square palette canvas filled with background index 0
+
+        :param dimensions: canvas width and height
+        :type dimensions: int
+        :return: canvas image
+        :rtype: Image.Image
+        """
+        from PIL import Image
+
+        canvas = getattr(self._tls, "canvas", None)
+        if canvas is None or canvas.width != dimensions:
+            canvas = self._tls.canvas = Image.new("P", (dimensions,) * 2, 0)
+        else:
+            canvas.paste(0, (0, 0, dimensions, dimensions))
+        return canvas
+
+    def _stream(self) -> io.BytesIO:
+        """Get this thread's empty stream for saving images
+
+        :return: empty stream
+        :rtype: io.BytesIO
+        """
+        stream = getattr(self._tls, "stream", None)
+        if stream is None:
+            stream = self._tls.stream = io.BytesIO()
+        else:
+            stream.seek(0)
+            stream.truncate()
+        return stream
+
+    def _save(self, image: Image.Image, stream: io.BytesIO) -> bytes:
+        """Save image to an empty stream in `image_format`
+
+        :param image: image to save
+        :type image: Image.Image
+        :param stream: empty stream
+        :type stream: io.BytesIO
+        :raises ValueError: if Pillow does not support `image_format`
+        :return: encoded image bytes
         :rtype: bytes
         """
+        if self.format in ("jpg", "jpeg"):
+            params = {"quality": self.quality}
+        else:
+            params = {"compress_level": self.compress_level}
+
+        # Save the image to stream.
+        try:
+            image.save(stream, format=self.format, optimize=self.optimize, **params)
+        except KeyError:
+            raise ValueError(
+                "Pillow does not support requested image format: %s" % self.format
+            )
+        return stream.getvalue()
+
+    def generate(
+        self, data: str | bytes, avatar_size: int = 120, padding: int = 0
+    ) -> bytes | np.ndarray:
+        """Generate pixel identicon
+
+        :param data: avatar data, hex string or raw bytes
+        :type data: str | bytes
+        :param avatar_size: generated square avatar dimensions
+        :type avatar_size: int
+        :param padding: generated square avatar dimensions
+        :type avatar_size: int
+        :return: bytes of generated avatar encoded by PIL in `image_format`, pixels array for "raw"
+        :rtype: bytes | np.ndarray
+        """
 
         """
             Copyright (c) 2013, Branko Majic
@@ -278,78 +641,62 @@ class PixelGenerator(BaseGenerator):
             SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
         """
 
-        data = self._data_to_byte_list(data)
-
-        background, foreground = (
-            self.background,
-            self.foreground_colors[
-                data[0] % len(self.foreground_colors)
-            ],  # Select foreground color
+        raw = np.frombuffer(
+            data if isinstance(data, (bytes, bytearray)) else bytes.fromhex(data),
+            dtype=np.uint8,
         )
-        # Swap selected colors
-        if self.invert:
-            background, foreground = foreground, background
-
-        image = Image.new(
-            "RGB"
-            if self.format.lower() in ("jpg", "jpeg")
-            else "RGBA",  # Account for non-transparent jp(e)g images
-            (avatar_size + padding * 2,) * 2,
-            background,
-        )
-
-        draw = ImageDraw.Draw(image)
+        matrix = None if self._jit else self._matrix(raw)
 
-        # Initialise the matrix (list of rows) that will be returned.
-        matrix = [[False] * self.size for _ in range(self.size)]
+        if self.format == "raw":
+            return self._render_raw(raw, matrix, avatar_size, padding)
 
-        # Process the cells one by one.
-
-        # Since the identicon needs to be symmetric, we'll need to work on half
-        # the columns (rounded-up), and reflect where necessary.
-        for cell in range(self.size * (self.size // 2 + self.size % 2)):
-            # If the bit from hash correpsonding to this cell is 1, mark the
-            # cell as foreground one. Do not use first byte (since that one is
-            # used for determining the foreground colour.
-            if self._get_bit(cell, data[1:]):
-                # Determine the cell coordinates in matrix.
-                column = cell // self.size
-                row = cell % self.size
+        # Return the resulting image bytes.
+        return self._save(
+            self._render(raw, matrix, avatar_size, padding), self._stream()
+        )
 
-                # Mark the cell and its reflection. Central column may get
-                # marked twice, but we don't care.
-                matrix[row][column] = True
-                matrix[row][self.size - column - 1] = True
+    def generate_many(
+        self,
+        data: Iterable[str | bytes],
+        avatar_size: int = 120,
+        padding: int = 0,
+    ) -> Iterator[bytes | np.ndarray]:
+        """Generate pixel identicons for every item of `data`
 
-        block_size = avatar_size // self.size
-        # Go through all the elements of a matrix, and draw the rectangles.
-        for row, row_columns in enumerate(matrix):
-            for column, cell in enumerate(row_columns):
-                if cell:
-                    # Set-up the coordinates for a block.
-                    x1 = padding + column * block_size
-                    y1 = padding + row * block_size
-                    x2 = padding + (column + 1) * block_size - 1
-                    y2 = padding + (row + 1) * block_size - 1
-
-                    # Draw the rectangle.
-                    draw.rectangle((x1, y1, x2, y2), fill=foreground)
-
-        # Set-up a stream where image will be saved.
-        stream = io.BytesIO()
+        Data of the same length is unpacked at once.
 
-        # Save the image to stream.
-        try:
-            image.save(stream, format=self.format, optimize=True)
-        except KeyError:
-            raise ValueError(
-                "Pillow does not support requested image format: %s" % self.format
+        :param data: avatars data, hex strings or raw bytes
+        :type data: Iterable[str | bytes]
+        :param avatar_size: generated square avatar dimensions
+        :type avatar_size: int
+        :param padding: generated square avatar dimensions
+        :type avatar_size: int
+        :return: iterator over bytes of generated avatars encoded by PIL in `image_format`, pixels arrays for "raw"
+        :rtype: Iterator[bytes | np.ndarray]
+        """
+        raws = [
+            item if isinstance(item, (bytes, bytearray)) else bytes.fromhex(item)
+            for item in data
+        ]
+        if not raws:
+            return
+        if len(set(map(len, raws))) != 1:
+            for raw in raws:
+                yield self.generate(raw, avatar_size, padding)
+            return
+
+        batch = np.frombuffer(b"".join(raws), dtype=np.uint8).reshape(len(raws), -1)
+        matrices = [None] * len(batch) if self._jit else self._matrix(batch)
+
+        if self.format == "raw":
+            for raw, matrix in zip(batch, matrices):
+                yield self._render_raw(raw, matrix, avatar_size, padding)
+            return
+
+        for raw, matrix in zip(batch, matrices):
+            yield self._save(
+                self._render(raw, matrix, avatar_size, padding), self._stream()
             )
-        image_raw = stream.getvalue()
-        stream.close()
-
-        # Return the resulting image bytes.
-        return image_raw
 
 
 __all__ = ["PixelGenerator"]
@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 from .preprocessors.base import BasePreprocessor
-from .preprocessors.hash import MD5Preprocessor
+from .preprocessors.hash import HashPreprocessor, MD5Preprocessor
 
 from .generators.base import BaseGenerator
 from .generators.image import PixelGenerator
 
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
 
 class Identicon:
@@ -21,24 +21,57 @@ class Identicon:
 
     def __init__(
         self,
-        preprocessors: list[BasePreprocessor] = [MD5Preprocessor()],
-        generator: BaseGenerator = PixelGenerator(),
+        preprocessors: list[BasePreprocessor] | None = None,
+        generator: BaseGenerator | None = None,
         check_entropy: bool = True,
     ):
         """Constructor
 
+        Defaults are created for every instance, so they do not share state.
+
         :param preprocessors: a list of data preprocessors, defaults to [MD5Preprocessor()]
-        :type preprocessors: list[BasePreprocessor], optional
-        :param generator: avatar generator, defaults to [PixelGenerator()]
-        :type generator: BaseGenerator, optional
+        :type preprocessors: list[BasePreprocessor] | None, optional
+        :param generator: avatar generator, defaults to PixelGenerator()
+        :type generator: BaseGenerator | None, optional
         """
+        if preprocessors is None:
+            preprocessors = [MD5Preprocessor()]
         if generator is None:
-            raise ValueError("Must specify generator or use default - PixelGenerator()")
+            generator = PixelGenerator()
 
-        self.preprocessors = preprocessors or []
+        self.preprocessors = preprocessors
         self.generator = generator
         self.check_entropy = check_entropy
 
+    def _processors(self) -> list[Callable[[Any], Any]]:
+        """Check entropy and collect process functions of preprocessors
+
+        :raises ValueError: if entropy provided by last preprocessor is not sufficient for `generator` required entropy, will not be raised if `check_entropy` is False
+        :return: process functions in order of `preprocessors`
+        :rtype: list[Callable[[Any], Any]]
+        """
+        if not self.preprocessors:
+            return []
+        last_preprocessor = self.preprocessors[-1]
+        if self.check_entropy and not self.generator.check_entropy(
+            last_preprocessor.entropy
+        ):
+            raise ValueError(
+                f"Entropy provided by preprocessor {last_preprocessor.__class__.__name__}: {last_preprocessor.entropy} is not sufficent for generator {self.generator.__class__.__name__}, minimal entropy {self.generator.entropy} required."
+            )
+        processors = [preprocessor.process for preprocessor in self.preprocessors[:-1]]
+        # Skip hex encoding of the last step if generator can use bytes, hex
+        # strings are only kept as input of the following preprocessors.
+        # Subclasses overriding process keep it, digest would bypass them.
+        process = getattr(type(last_preprocessor), "process", None)
+        if process is HashPreprocessor.process and getattr(
+            self.generator, "supports_bytes", False
+        ):
+            processors.append(last_preprocessor.digest)
+        else:
+            processors.append(last_preprocessor.process)
+        return processors
+
     def generate(self, data: Any) -> Any:
         """Generate avatar using specified preprocessors and generator
 
@@ -48,17 +81,26 @@ class Identicon:
         :return: generated avatar
         :rtype: Any
         """
-        if self.preprocessors:
-            last_preprocessor = self.preprocessors[-1]
-            if self.check_entropy and not self.generator.check_entropy(
-                last_preprocessor.entropy
-            ):
-                raise ValueError(
-                    f"Entropy provided by preprocessor {last_preprocessor.__class__.__name__}: {last_preprocessor.entropy} is not sufficent for generator {self.generator.__class__.__name__}, minimal entropy {self.generator.entropy} required."
-                )
-            for preprocessor in self.preprocessors:
-                data = preprocessor.process(data)
+        for process in self._processors():
+            data = process(data)
         return self.generator.generate(data)
 
+    def generate_many(self, data: Iterable[Any]) -> Iterator[Any]:
+        """Generate avatars for every item of `data`
+
+        Every preprocessor processes the whole batch at once, then `generator`
+        generates all the avatars, amortizing its per-avatar setup.
+
+        :param data: data items to be used in generation (usually email or ip strings)
+        :type data: Iterable[Any]
+        :raises ValueError: if entropy provided by last preprocessor is not sufficient for `generator` required entropy, will not be raised if `check_entropy` is False
+        :return: iterator over generated avatars
+        :rtype: Iterator[Any]
+        """
+        data = list(data)
+        for process in self._processors():
+            data = [process(item) for item in data]
+        return self.generator.generate_many(data)
+
 
 __all__ = ["Identicon"]
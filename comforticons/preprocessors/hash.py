@@ -1,9 +1,10 @@
 """Hash data preprocessors module"""
 from __future__ import annotations
 
+import codecs
+import functools
 import hashlib
 
-
 from .base import BasePreprocessor
 
 
@@ -22,10 +23,14 @@ class HashPreprocessor(BasePreprocessor):
         :type hash_func: Callable[[ReadableBuffer], _Hash], optional
         :param encoding: string encoding, defaults to "utf-8"
         :type encoding: str, optional
+        :raises LookupError: if `encoding` is unknown
         """
         super().__init__()
         self.hash_func = hash_func
-        self.encoding: str = encoding
+        # Canonical codec name, so aliases like "U8" use str.encode fast paths
+        # instead of the codec registry lookup on every call. Codecs registered
+        # without a name keep the passed one.
+        self.encoding: str = codecs.lookup(encoding).name or encoding
         self.entropy: int = self.calc_entropy()
 
     def calc_entropy(self) -> int:
@@ -48,6 +53,16 @@ class HashPreprocessor(BasePreprocessor):
         """
         return self.hash_func(data.encode(self.encoding)).hexdigest()
 
+    def digest(self, data: str) -> bytes:
+        """Process data with self.hash_func without hex encoding the result
+
+        :param data: data to process (usually an email or ip string)
+        :type data: str
+        :return: data digest bytes
+        :rtype: bytes
+        """
+        return self.hash_func(data.encode(self.encoding)).digest()
+
 
 class MD5Preprocessor(HashPreprocessor):
     """md5 data preprocessor"""
@@ -73,4 +88,30 @@ class SHA1Preprocessor(HashPreprocessor):
         super().__init__(hashlib.sha1, encoding)
 
 
-__all__ = ["HashPreprocessor", "MD5Preprocessor", "SHA1Preprocessor"]
+class BLAKE2Preprocessor(HashPreprocessor):
+    """blake2b data preprocessor
+
+    BLAKE2b is faster than md5 and sha1 and its digest size can be tuned
+    to match the generator required entropy.
+    """
+
+    def __init__(self, entropy_bits: int = 512, encoding: str = "utf-8"):
+        """blake2b data hash preprocessor
+
+        :param entropy_bits: provided entropy, rounded up to whole bytes (8-512), defaults to 512
+        :type entropy_bits: int, optional
+        :param encoding: string encoding, defaults to "utf-8"
+        :type encoding: str, optional
+        """
+        super().__init__(
+            functools.partial(hashlib.blake2b, digest_size=-(-entropy_bits // 8)),
+            encoding,
+        )
+
+
+__all__ = [
+    "HashPreprocessor",
+    "MD5Preprocessor",
+    "SHA1Preprocessor",
+    "BLAKE2Preprocessor",
+]